@@ -1,14 +1,26 @@
 #! /usr/bin/python
+import atexit
 import os
-import glob
 import re
+import struct
 import argparse
+import json
 import logging
 import subprocess
-import json
 import sys
-from multiprocessing import Pool
-from typing import Optional
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# orjson parses exiftool's output straight from bytes and is a good deal faster
+# on big batches, but it's optional
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 logging.StreamHandler(sys.stdout)
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(name)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
@@ -31,6 +43,226 @@ ALLOWED_EXT = [
 
 DESC_KEY = 'Description'
 NUM_THREADS = 8
+# How many files are handed to exiftool per batch
+BATCH_SIZE = 250
+# Descriptions seen on earlier runs, stored in the root directory (see ImageDescriptionWriter)
+CACHE_FILENAME = '.exif_writer_cache.json'
+# Stands in for "not known" (not cached, couldn't be read), since a description can be None
+_UNKNOWN = object()
+
+# exiftool's Description tag is XMP dc:description, stored in the XMP packet of a JPEG's APP1 segment
+XMP_HEADER = b'http://ns.adobe.com/xap/1.0/\x00'
+_DC_DESCRIPTION = '{http://purl.org/dc/elements/1.1/}description'
+_RDF_LI = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}li'
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# The summary lines exiftool prints after a write command, e.g. "    1 image files updated"
+WRITE_SUMMARY_RE = re.compile(rb"^\s*(\d+) (?:image )?files (updated|unchanged|failed condition|weren't updated due to errors)", re.M)
+
+
+def parse_write_summary(output: bytes) -> Dict[str, int]:
+    """
+    Given the stdout of an exiftool write command, return a mapping of
+    status ("updated", "unchanged", ...) to the number of files with that status
+    """
+    return {status.decode('UTF-8'): int(count) for count, status in WRITE_SUMMARY_RE.findall(output)}
+
+
+def parse_xmp_description(xmp: bytes) -> Optional[str]:
+    """
+    Given an XMP packet, return its dc:description the way exiftool reports
+    it (the x-default language, else the first one)
+    """
+    root = ElementTree.fromstring(xmp)
+    for description in root.iter(_DC_DESCRIPTION):
+        items = list(description.iter(_RDF_LI))
+        for item in items:
+            if item.get(_XML_LANG) == 'x-default':
+                return item.text
+        return items[0].text if items else None
+    return None
+
+
+def read_description(file_path: str):
+    """
+    Given a JPEG file path, read its description in-process by walking the
+    segment headers up to the image data and parsing only the XMP APP1
+    segment.  Returns _UNKNOWN if it can't be read this way, so the caller can
+    fall back to exiftool.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if f.read(2) != b'\xff\xd8':  # SOI
+                return _UNKNOWN
+            while True:
+                header = f.read(4)
+                if len(header) < 4 or header[0] != 0xFF:
+                    return _UNKNOWN
+                marker, length = struct.unpack('>xBH', header)
+                if marker in (0xD9, 0xDA):  # EOI, SOS: the metadata segments are all behind us
+                    return None
+                if marker == 0xFF or length < 2:  # Fill bytes or a broken segment, let exiftool sort it out
+                    return _UNKNOWN
+                length -= 2
+                if marker == 0xE1 and length > len(XMP_HEADER):  # APP1, holds either EXIF or XMP
+                    if f.read(len(XMP_HEADER)) == XMP_HEADER:
+                        return parse_xmp_description(f.read(length - len(XMP_HEADER)))
+                    length -= len(XMP_HEADER)
+                f.seek(length, os.SEEK_CUR)
+    except (OSError, SyntaxError, ValueError):
+        # Unreadable files and broken XMP (ElementTree.ParseError is a SyntaxError)
+        return _UNKNOWN
+
+
+def _walk(root: str, extensions: Sequence[str]) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """
+    Recursively yield (directory, entries) for every directory under root that
+    holds files with one of the given extensions.  Uses the cached DirEntry
+    info from os.scandir so we don't stat every file, and skips hidden files
+    and directories like glob does.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in extensions:
+                        files.append(entry)
+        except OSError as err:
+            logger.warning("Unable to list directory %s: %s", directory, err)
+        if files:
+            yield directory, files
+
+
+def _argfile_line(arg: str) -> bytes:
+    """
+    Format a single argument as a line of a -@ argfile.  Arguments are encoded
+    the way the OS encodes filenames, so undecodable names keep their original
+    bytes.  exiftool splits lines on newlines, trims surrounding whitespace and
+    skips lines starting with '#', so any argument that would be changed by that
+    is written as a #[CSTR] C string with its newlines (and backslashes) escaped.
+    """
+    line = os.fsencode(arg)
+    if (b'\n' in line or b'\r' in line or line.startswith(b'#')
+            or line[:1].isspace() or line[-1:].isspace()):
+        line = b'#[CSTR]' + line.replace(b'\\', b'\\\\').replace(b'\n', b'\\n').replace(b'\r', b'\\r')
+    return line + b'\n'
+
+
+def _terminate_exiftool(process: subprocess.Popen):
+    """
+    Ask a -stay_open exiftool process to exit and wait for it
+    """
+    try:
+        process.stdin.write(b'-stay_open\nFalse\n')
+        process.stdin.flush()
+        process.communicate(timeout=5)
+    except (OSError, ValueError):
+        pass
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+
+
+class ExifToolDaemon:
+    """
+    A long-lived exiftool process started with "-stay_open True -@ -".  Commands
+    are written to its stdin as argfile lines and the output for each one is
+    read back from stdout up to the "{ready}" marker, so we only pay the perl
+    startup cost once instead of on every call.
+
+    The process is started lazily on the first command.  Commands are
+    serialized with a lock, so give each thread its own daemon to run them
+    in parallel.
+    """
+
+    def __init__(self, executable: str = 'exiftool'):
+        self.executable = executable
+        self._process = None
+        self._finalizer = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        if self._process is not None:
+            return
+        cmd = [self.executable,
+            '-stay_open', 'True',
+            '-@', '-',
+            '-common_args', '-ignoreMinorErrors'
+        ]
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._finalizer = weakref.finalize(self, _terminate_exiftool, self._process)
+
+    def execute(self, *args: str) -> bytes:
+        """
+        Run a single exiftool command (one argument per element) and return its stdout
+        """
+        return self.execute_many([args])[0]
+
+    def execute_many(self, commands: Sequence[Sequence[str]]) -> List[bytes]:
+        """
+        Run a batch of exiftool commands and return the stdout of each one.
+
+        All of the commands are written in one go using numbered -executeNUM
+        markers, then the outputs are read back by their {readyNUM} markers.
+        """
+        if not commands:
+            return []
+        with self._lock:
+            try:
+                return self._execute_many(commands)
+            except BaseException:
+                # A dead exiftool, or one with unread output left in the pipe, can't run
+                # any more commands, so throw it away and let the next command start a fresh one
+                self._close(kill=True)
+                raise
+
+    def _execute_many(self, commands: Sequence[Sequence[str]]) -> List[bytes]:
+        self.start()
+        argfile = b''.join(
+            b''.join(_argfile_line(arg) for arg in args) + f'-execute{num}\n'.encode('UTF-8')
+            for num, args in enumerate(commands)
+        )
+        self._process.stdin.write(argfile)
+        self._process.stdin.flush()
+
+        outputs = []
+        output = []
+        for line in iter(self._process.stdout.readline, b''):
+            if line.rstrip() == f'{{ready{len(outputs)}}}'.encode('UTF-8'):
+                outputs.append(b''.join(output))
+                output = []
+                if len(outputs) == len(commands):
+                    return outputs
+            else:
+                output.append(line)
+        raise subprocess.SubprocessError('exiftool exited unexpectedly')
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self, kill: bool = False):
+        if kill and self._process is not None:
+            self._process.kill()
+        if self._finalizer is not None:
+            self._finalizer()
+        self._process = None
+        self._finalizer = None
+
 
 class ImageDescriptionWriter:
 
@@ -39,164 +271,441 @@ class ImageDescriptionWriter:
                  prefix: str,
                  existing_prefix: str = None,
                  force: bool = False,
-                 dry_run: bool = False):
+                 dry_run: bool = False,
+                 num_threads: int = NUM_THREADS,
+                 use_cache: bool = True,
+                 exiftool: Optional[ExifToolDaemon] = None):
         self.directory = directory
         self.prefix = prefix
         self.existing_prefix = existing_prefix or prefix
+        # exiftool evaluates the -if condition as perl, so "/" and "@" need escaping on top of re.escape
+        self._escaped_prefix = re.escape(self.existing_prefix).replace('/', r'\/').replace('@', r'\@')
+        # The exiftool -if expression matching files whose description is empty
+        # or contains the existing prefix (and is therefore safe to overwrite)
+        self.replaceable_condition = f'not ${DESC_KEY} or ${DESC_KEY} =~ /{self._escaped_prefix}/'
         self.force = force
         self.dry_run = dry_run
+        self.num_threads = num_threads
+
+        # Unless a daemon is passed in, every worker thread lazily starts its own
+        self._shared_exiftool = exiftool
+        self._thread_local = threading.local()
+        self._daemons = []
+        self._daemons_lock = threading.Lock()
 
         self.root_dir_length = len(directory)
         self.update_msg = "[DRY RUN] Updated" if dry_run else "Updated"
 
+        # Maps each file (relative to the root) to [inode, mtime_ns, description] as of the
+        # last time we read or wrote it, so unchanged files can skip exiftool entirely
+        self._cache_path = os.path.join(directory, CACHE_FILENAME) if use_cache else None
+        self._cache = self.load_cache() if use_cache else None
+        if use_cache and not dry_run:
+            atexit.register(self.save_cache)
+
+    def load_cache(self) -> Dict[str, list]:
+        try:
+            with open(self._cache_path, 'rb') as f:
+                return json_loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            logger.warning('Unable to load cache %s, starting a new one: %s', self._cache_path, err)
+            return {}
+
+    def save_cache(self):
+        tmp_path = f'{self._cache_path}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='UTF-8') as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as err:
+            logger.warning('Unable to save cache %s: %s', self._cache_path, err)
+
+    def _get_cached_description(self, filepath: str):
+        """
+        Given a file path, return its cached description, or _UNKNOWN if it
+        isn't cached or the file has changed since
+        """
+        if self._cache is None:
+            return _UNKNOWN
+        cached = self._cache.get(filepath[self.root_dir_length:].lstrip(os.sep))
+        if cached is None:
+            return _UNKNOWN
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return _UNKNOWN
+        if cached[0] != stat.st_ino or cached[1] != stat.st_mtime_ns:
+            return _UNKNOWN
+        return cached[2]
+
+    def _set_cached_description(self, filepath: str, desc: Optional[str]):
+        if self._cache is None:
+            return
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return
+        self._cache[filepath[self.root_dir_length:].lstrip(os.sep)] = [stat.st_ino, stat.st_mtime_ns, desc]
+
+    @property
+    def exiftool(self) -> ExifToolDaemon:
+        """
+        The exiftool daemon for the current thread
+        """
+        if self._shared_exiftool is not None:
+            return self._shared_exiftool
+        daemon = getattr(self._thread_local, 'exiftool', None)
+        if daemon is None:
+            daemon = self._thread_local.exiftool = ExifToolDaemon()
+            with self._daemons_lock:
+                self._daemons.append(daemon)
+        return daemon
+
+    def _init_worker(self):
+        """
+        Runs once in each worker thread of the pool: set up and start that
+        thread's exiftool daemon before it picks up its first batch
+        """
+        try:
+            self.exiftool.start()
+        except OSError as err:
+            # Don't break the pool, the batches will report their own failures
+            logger.error('Unable to start exiftool: %s', err)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        with self._daemons_lock:
+            daemons, self._daemons = self._daemons, []
+        for daemon in daemons:
+            daemon.close()
+        if self._shared_exiftool is not None:
+            self._shared_exiftool.close()
+
     def exiftool_exists() -> bool:
         # TODO: Implement this
         pass
 
-    @staticmethod
-    def get_field(file_path: str, field_name: str) -> Optional[object]:
+    def get_fields(self, file_paths: List[str], field_name: str) -> Dict[str, object]:
         """
-        Given a file path and a field name, get that field from the Exif data using exiftool
+        Given a list of file paths and a field name, get that field from the Exif
+        data of all of the files with a single exiftool command.  Files exiftool
+        could not read are left out of the result.
         """
+        if not file_paths:
+            return {}
         try:
-            cmd = ['exiftool',
-                '-ignoreMinorErrors',
-                '-json',
-                '-{}'.format(field_name), file_path
-            ]
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if proc.returncode != 0:
-                logger.warn(f'Unable to get field "{field_name}" for image {file_path}')
-                return None
-            else:
-                result_json = json.loads(proc.stdout.decode('UTF-8'))
-                return result_json[0].get(field_name)
-        except subprocess.CalledProcessError as err:
-            logger.error('Call to exiftool failed:', err)
-            return None
+            output = self.exiftool.execute('-json', '-{}'.format(field_name), *file_paths)
+            result_json = json_loads(output) if output else []
+        except ValueError as err:
+            if len(file_paths) > 1:
+                # One file name that isn't valid UTF-8 spoils the JSON for the whole
+                # batch, so read the files one at a time to only lose that one
+                results = {}
+                for file_path in file_paths:
+                    results.update(self.get_fields([file_path], field_name))
+                return results
+            logger.error('Call to exiftool failed: %s', err)
+            result_json = []
+        except (OSError, subprocess.SubprocessError) as err:
+            logger.error('Call to exiftool failed: %s', err)
+            result_json = []
 
-    @classmethod
-    def get_description(cls, file_path: str) -> Optional[str]:
+        # -json gives numeric looking values back as numbers, so make them strings again
+        results = {result['SourceFile']: None if result.get(field_name) is None else str(result[field_name])
+                   for result in result_json}
+        for file_path in file_paths:
+            if file_path not in results:
+                logger.warning('Unable to get field "%s" for image %s', field_name, file_path)
+        return results
+
+    def get_field(self, file_path: str, field_name: str) -> Optional[object]:
         """
-        Given a file path, get the Description exif field
+        Given a file path and a field name, get that field from the Exif data using exiftool
         """
-        return cls.get_field(file_path, DESC_KEY)
+        return self.get_fields([file_path], field_name).get(file_path)
 
-    @staticmethod
-    def set_field(file_path: str, field_name: str, value: str, overwrite: bool = True) -> bool:
+    def get_descriptions(self, file_paths: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Given a list of file paths, get the Description exif field of each
+        """
+        return self.get_fields(file_paths, DESC_KEY)
+
+    def get_description(self, file_path: str) -> Optional[str]:
+        """
+        Given a file path, get the Description exif field, in-process if
+        possible and through exiftool otherwise
+        """
+        desc = read_description(file_path)
+        if desc is _UNKNOWN:
+            return self.get_field(file_path, DESC_KEY)
+        return desc
+
+    def set_field(self, file_path: str, field_name: str, value: str, overwrite: bool = True) -> bool:
         try:
-            cmd = ['exiftool',
-                '-ignoreMinorErrors',
-                f'-{field_name}={value}'.format(field_name)
-            ]
+            args = [f'-{field_name}={value}']
             if overwrite:
-                cmd.append('-overwrite_original')
-            cmd.append(file_path)
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if proc.returncode != 0:
-                logger.warning(f'Unable to set field "{field_name}" to "{value}" for image {file_path}')
+                args.append('-overwrite_original')
+            args.append(file_path)
+            summary = parse_write_summary(self.exiftool.execute(*args))
+            if not (summary.get('updated') or summary.get('unchanged')):
+                logger.warning('Unable to set field "%s" to "%s" for image %s', field_name, value, file_path)
                 return False
             else:
                 return True
-        except subprocess.CalledProcessError as err:
-            logger.error('Call to exiftool failed:', err)
+        except subprocess.SubprocessError as err:
+            logger.error('Call to exiftool failed: %s', err)
             return False
 
-    @classmethod
-    def set_description(cls, file_path: str, value: str) -> bool:
+    def set_description(self, file_path: str, value: str) -> bool:
         """
         Given a file path and a description string, write the Description field
         of the file
         """
-        return cls.set_field(file_path, DESC_KEY, value)
+        return self.set_field(file_path, DESC_KEY, value)
 
-    @classmethod
-    def remove_description(cls, file_path: str):
+    def remove_description(self, file_path: str):
         """
         Given a file path, remove the description metadata on the file
         """
-        return cls.set_description(file_path, '')
+        return self.set_description(file_path, '')
+
+    def get_directory_tags(self, dir_path: str) -> str:
+        """
+        Given a directory, split its path below the root into space separated
+        "tags", ending in a separator so that a filename can be appended
+        """
+        trimmed_path = os.path.join(dir_path, '')[self.root_dir_length:]
+        return ' '.join(trimmed_path.split(os.sep))
+
+    def _file_error(self, filepath: str, e: Exception) -> int:
+        """
+        Log an error processing a single file and return its error code
+        """
+        if isinstance(e, OSError):
+            logger.warning("Unable to process image %s (OSError): %s", filepath, e)
+        elif isinstance(e, TypeError):
+            logger.warning("Unable to process image %s (TypeError): %s", filepath, e)
+        else:
+            logger.error("Unexpected error occured while processing image %s: %s", filepath, e)
+        return -1
+
+    def _read_descriptions(self, filepaths: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Given a list of file paths, get their descriptions, from the cache or
+        in-process where possible and with a single exiftool call for the rest.
+        Files that couldn't be read are left out of the result.
+        """
+        descs = {}
+        to_read = []
+        for filepath in filepaths:
+            try:
+                desc = self._get_cached_description(filepath)
+                if desc is _UNKNOWN:
+                    desc = read_description(filepath)
+                    if desc is _UNKNOWN:
+                        to_read.append(filepath)
+                        continue
+                    self._set_cached_description(filepath, desc)
+                descs[filepath] = desc
+            except Exception as e:
+                self._file_error(filepath, e)
+        for filepath, desc in self.get_descriptions(to_read).items():
+            try:
+                self._set_cached_description(filepath, desc)
+                descs[filepath] = desc
+            except Exception as e:
+                self._file_error(filepath, e)
+        return descs
+
+    def _needs_write(self, desc: Optional[str], new_desc: str) -> bool:
+        """
+        Whether a file with the given description should get the new one
+        """
+        return new_desc != desc and (not desc or self.existing_prefix in desc or self.force)
 
-    def write_directory_structure(self, filepath: str) -> int:
+    def _dry_run_result(self, filepath: str, desc: Optional[str], new_desc: str) -> int:
         """
-        Given a file path, create a description, parse the existing description
-        and replace if necessary.
+        Nothing gets written in a dry run, so compare the existing description ourselves
+        """
+        if not desc or self.existing_prefix in desc or self.force:
+            if new_desc != desc:
+                logger.debug("%s %s: '%s'", self.update_msg, filepath, new_desc)
+                return 0
+            else:
+                logger.debug("NOT Updated (already written) %s: '%s'", filepath, desc)
+                return 1
+        else:
+            logger.debug("NOT Updated %s: '%s'", filepath, desc)
+            return 1
+
+    def _write_result(self, filepath: str, new_desc: str, output: bytes) -> int:
+        """
+        Map the output of a conditional description write to a return code
+        """
+        summary = parse_write_summary(output)
+        if summary.get('updated'):
+            self._set_cached_description(filepath, new_desc)
+            logger.debug("%s %s: '%s'", self.update_msg, filepath, new_desc)
+            return 0
+        elif summary.get('unchanged'):
+            self._set_cached_description(filepath, new_desc)
+            logger.debug("NOT Updated (already written) %s: '%s'", filepath, new_desc)
+            return 1
+        elif summary.get('failed condition'):
+            # Cache the description we weren't allowed to replace so warm runs skip the file
+            desc = read_description(filepath)
+            if desc is not _UNKNOWN:
+                self._set_cached_description(filepath, desc)
+            logger.debug("NOT Updated %s", filepath)
+            return 1
+        else:
+            logger.warning('Unable to set field "%s" to "%s" for image %s', DESC_KEY, new_desc, filepath)
+            return -1
 
-        Return codes:
+    def write_directory_structure(self, dir_path: str, entries: List[os.DirEntry]) -> List[int]:
+        """
+        Given a directory and a batch of its files, create a description for
+        each, parse the existing description and replace if necessary.
+
+        Return codes (one per file):
             0  Updated
             1  Skipped
             -1 Error
         """
-        ext = os.path.splitext(filepath)[1].lower()
-        try:
-            if ext == '.jpg':
-                # Pull out exif data from the image
-                desc = self.get_description(filepath)
-                # import ipdb; ipdb.set_trace()
-                if not desc or self.existing_prefix in desc or self.force:
-                    # Clean up the path and split the path components into "tags"
-                    trimmed_path = filepath[self.root_dir_length:]
-                    split_path = ' '.join(trimmed_path.split('/'))
-                    new_desc = f'{self.prefix} {split_path}'
-
-                    # Only write to the file if dry_run is false and we actually have updates
-                    if new_desc != desc:
-                        if not self.dry_run:
-                            # Update the exif dict and write it to the file
-                            self.set_description(filepath, new_desc)
-                        logger.debug(f"{self.update_msg} {filepath}: '{new_desc}'")
-                        return 0
-                    else:
-                        logger.debug(f"NOT Updated (already written) {filepath}: '{desc}'")
+        filepaths = [entry.path for entry in entries]
+        # The directory part of the description is the same for every file in it
+        dir_tags = self.get_directory_tags(dir_path)
+        new_descs = [f'{self.prefix} {dir_tags}{entry.name}' for entry in entries]
+
+        if self.dry_run:
+            descs = self._read_descriptions(filepaths)
+            results = []
+            for filepath, new_desc in zip(filepaths, new_descs):
+                if filepath not in descs:
+                    results.append(-1)
+                    continue
+                try:
+                    results.append(self._dry_run_result(filepath, descs[filepath], new_desc))
+                except Exception as e:
+                    results.append(self._file_error(filepath, e))
+            return results
+
+        # Files whose description is cached and doesn't need replacing skip exiftool
+        results = {}
+        to_write = []
+        for filepath, new_desc in zip(filepaths, new_descs):
+            try:
+                desc = self._get_cached_description(filepath)
+                if desc is not _UNKNOWN and not self._needs_write(desc, new_desc):
+                    logger.debug("NOT Updated (cached) %s: '%s'", filepath, desc)
+                    results[filepath] = 1
                 else:
-                    logger.debug(f"NOT Updated {filepath}: '{desc}'")
-                    return 1
-        except OSError as e:
-            logger.warning(f"Unable to process image {filepath} (OSError)")
-            return -1
-        except TypeError as e:
-            print(e)
-            logger.warning(f"Unable to process image {filepath} (TypeError)")
-            return -1
-        except Exception as e:
-            logger.error(f"Unexpected error occured while processing image {filepath}.", e)
-            return -1
+                    to_write.append((filepath, new_desc))
+            except Exception as e:
+                results[filepath] = self._file_error(filepath, e)
 
-    def clean_directory_metadata(self, filepath: str) -> int:
-        ext = os.path.splitext(filepath)[1].lower()
+        # Let exiftool do the read/compare/write for the rest, one conditional command per file
+        commands = []
+        for filepath, new_desc in to_write:
+            args = ['-overwrite_original']
+            if not self.force:
+                args += ['-if', self.replaceable_condition]
+            args += [f'-{DESC_KEY}={new_desc}', filepath]
+            commands.append(args)
         try:
-            if ext == '.jpg':
-                desc = self.get_description(filepath)
-                if desc and self.existing_prefix in desc:
+            outputs = self.exiftool.execute_many(commands)
+        except Exception as e:
+            logger.error('Call to exiftool failed for images %s...: %s', to_write[0][0], e)
+            outputs = [None] * len(to_write)
+        for (filepath, new_desc), output in zip(to_write, outputs):
+            if output is None:
+                results[filepath] = -1
+                continue
+            try:
+                results[filepath] = self._write_result(filepath, new_desc, output)
+            except Exception as e:
+                results[filepath] = self._file_error(filepath, e)
+        return [results[filepath] for filepath in filepaths]
+
+    def clean_directory_metadata(self, dir_path: str, entries: List[os.DirEntry]) -> List[int]:
+        """
+        Given a directory and a batch of its files, remove the description of
+        any file that was written by us (has the existing prefix)
+        """
+        filepaths = [entry.path for entry in entries]
+        descs = self._read_descriptions(filepaths)
+        results = {}
+        to_remove = []
+        for filepath in filepaths:
+            if filepath not in descs:
+                results[filepath] = -1
+                continue
+            desc = descs[filepath]
+            if desc and self.existing_prefix in desc:
+                to_remove.append(filepath)
+            else:
+                logger.debug("NOT Updated %s: '%s'", filepath, desc)
+                results[filepath] = 1
+
+        if self.dry_run:
+            outputs = [b''] * len(to_remove)
+        else:
+            try:
+                # Writing an empty value removes the tag
+                outputs = self.exiftool.execute_many(
+                    [[f'-{DESC_KEY}=', '-overwrite_original', filepath] for filepath in to_remove])
+            except Exception as e:
+                logger.error('Call to exiftool failed for images %s...: %s', to_remove[0], e)
+                outputs = [None] * len(to_remove)
+        for filepath, output in zip(to_remove, outputs):
+            if output is None:
+                results[filepath] = -1
+                continue
+            try:
+                summary = parse_write_summary(output)
+                if self.dry_run or summary.get('updated') or summary.get('unchanged'):
                     if not self.dry_run:
-                        self.remove_description(filepath)
-                    logger.debug(f"{self.update_msg} {filepath} -- Removed description")
-                    return 0
+                        self._set_cached_description(filepath, None)
+                    logger.debug("%s %s -- Removed description", self.update_msg, filepath)
+                    results[filepath] = 0
                 else:
-                    logger.debug(f"NOT Updated {filepath}: '{desc}'")
-                    return 1
-            else:
-                return 1
-        except Exception as e:
-            logger.error(f"Unexpected error occured while processing image {filepath}.", e)
-            return -1
+                    logger.warning('Unable to remove field "%s" for image %s', DESC_KEY, filepath)
+                    results[filepath] = -1
+            except Exception as e:
+                results[filepath] = self._file_error(filepath, e)
 
+        return [results[filepath] for filepath in filepaths]
 
     def execute_on_files(self, func):
-        files = glob.glob('{}/**/*.*'.format(self.directory), recursive=True)
-        files = [f for f in files if os.path.splitext(f)[1].lower() in ALLOWED_EXT]
-
-        logger.info("Found {} files in {}".format(len(files), self.directory))
+        # Each directory is submitted (in batches) as soon as the walk has listed it, so
+        # processing overlaps with the walk.  The workers just wait on exiftool, so threads
+        # are enough and nothing gets pickled.
+        with ThreadPoolExecutor(max_workers=self.num_threads, initializer=self._init_worker) as executor:
+            try:
+                futures = [executor.submit(func, dir_path, entries[i:i + BATCH_SIZE])
+                           for dir_path, entries in _walk(self.directory, ALLOWED_EXT)
+                           for i in range(0, len(entries), BATCH_SIZE)]
+                # Count the values for logging
+                counts = Counter()
+                for future in futures:
+                    counts.update(future.result())
+            except BaseException:
+                # On Ctrl-C (or any error) drop the queued batches rather than writing them all
+                # before exiting; only the batches already running get to finish
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
 
-        with Pool(5) as p:
-            results = p.map(func, files)
+        logger.info("Found %s files in %s", sum(counts.values()), self.directory)
 
-        # Count the values for logging
-        updated_count = results.count(0)
-        skipped_count = results.count(1)
-        errored_count = results.count(-1)
+        updated_count = counts[0]
+        skipped_count = counts[1]
+        errored_count = counts[-1]
 
-        logger.info(f'{self.update_msg} {updated_count} files, Skipped {skipped_count} files, Failed {errored_count}')
+        logger.info('%s %s files, Skipped %s files, Failed %s', self.update_msg, updated_count, skipped_count, errored_count)
 
     def write_metadata(self):
         self.execute_on_files(self.write_directory_structure)
@@ -213,12 +722,24 @@ def __main__(args):
     if args.dry_run:
         logger.info('Running in DRY RUN mode.  No files will be modified.')
 
-    imgWriter = ImageDescriptionWriter(args.dir, args.prefix, args.existing_prefix, args.f, args.dry_run)
+    with ImageDescriptionWriter(args.dir, args.prefix, args.existing_prefix, args.f, args.dry_run, args.threads,
+                                not args.no_cache) as imgWriter:
+        if args.action == 'write':
+            imgWriter.write_metadata()
+        elif args.action == 'clean':
+            imgWriter.clean_metadata()
 
-    if args.action == 'write':
-        imgWriter.write_metadata()
-    elif args.action == 'clean':
-        imgWriter.clean_metadata()
+def _positive_int(value: str) -> int:
+    """
+    argparse type for options that must be a whole number of at least 1
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value: {value!r}')
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {number}')
+    return number
 
 parser = argparse.ArgumentParser(description='Write EXIF metadata to files based on their directory structure')
 parser.add_argument('action', help='Write or clean the metadata from the files.', choices=['write', 'clean'], default='write')
@@ -229,6 +750,8 @@ parser.add_argument('--existing-prefix', help='An alternative prefix which to se
 parser.add_argument('-v', action='store_true', help='Verbose')
 parser.add_argument('-q', action='store_true', help='Quiet (minimize output)')
 parser.add_argument('-d', '--dry-run', action='store_true', help='Dry run (don\'t write any changes)')
+parser.add_argument('--no-cache', action='store_true', help=f'Don\'t read or write the {CACHE_FILENAME} description cache')
+parser.add_argument('-t', '--threads', type=_positive_int, default=NUM_THREADS, help='Number of exiftool processes to run in parallel')
 args = parser.parse_args()
 
 __main__(args)
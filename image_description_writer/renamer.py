@@ -1,14 +1,15 @@
 #! /usr/bin/python
 import os
-import glob
 import re
 import argparse
 import logging
 import subprocess
 import json
+import string
 import sys
+from collections import Counter
 from multiprocessing import Pool
-from typing import Optional, List
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 logging.StreamHandler(sys.stdout)
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(name)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
@@ -39,12 +40,52 @@ REPLACEABLE_PATTERNS = [
     r'839A.*',
     r'MVI_.*'
 ]
+# Compiled once so each file costs a single match instead of one per pattern
+_REPLACEABLE_RE = re.compile('|'.join(f'(?:{p})' for p in REPLACEABLE_PATTERNS))
 
 DESC_KEY = 'Description'
 NUM_THREADS = 8
 SPACE_REPLACEMENT = '-'
 DIR_SEPARATOR = '_'
 
+# Single-pass translation for clean_dirname: drops anything outside [a-zA-Z0-9_\- ],
+# lowercases and swaps spaces for dashes.  Only covers ASCII, see clean_dirname.
+_CLEAN_TRANS = str.maketrans({
+    **{c: None for c in map(chr, range(128)) if not (c in string.ascii_letters or c in string.digits or c in '_- ')},
+    **{c: c.lower() for c in string.ascii_uppercase},
+    ' ': SPACE_REPLACEMENT,
+})
+
+# Where supported (Linux, macOS), renames are done relative to an open fd of the
+# parent directory so the kernel doesn't resolve the full path for every file
+_RENAME_DIR_FD = os.rename in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+
+
+def _walk(root: str, extensions: Sequence[str]) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """
+    Recursively yield (directory, entries) for every directory under root that
+    holds files with one of the given extensions.  Uses the cached DirEntry
+    info from os.scandir so we don't stat every file, and skips hidden files
+    and directories like glob does.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in extensions:
+                        files.append(entry)
+        except OSError as err:
+            logger.warning("Unable to list directory %s: %s", directory, err)
+        if files:
+            yield directory, files
+
 class ImageRenamer:
 
     def __init__(self,
@@ -66,12 +107,9 @@ class ImageRenamer:
         Given a file path, break it into its constituants in the form
         (dir_string, filename_base, extension (with "."))
         """
-        split = os.path.split(file_path)
-        dir_string = split[0]
-        filename = split[1]
-        filename_base = os.path.splitext(filename)[0]
-        ext = os.path.splitext(filename)[1].lower()
-        return (dir_string, filename_base, ext)
+        dir_string, filename = os.path.split(file_path)
+        filename_base, ext = os.path.splitext(filename)
+        return (dir_string, filename_base, ext.lower())
 
     @staticmethod
     def clean_dirname(dirname: str) -> str:
@@ -81,92 +119,125 @@ class ImageRenamer:
             - replace spaces with dashes
             - lowercase the jawn
         """
-        return re.sub(r'[^a-zA-Z0-9_\- ]', '', dirname)\
-            .lower()\
-            .replace(" ", "-")
+        if not dirname.isascii():
+            # Non-ASCII characters are never allowed, drop them before translating
+            dirname = dirname.encode('ascii', 'ignore').decode('ascii')
+        return dirname.translate(_CLEAN_TRANS)
 
-    def write_directory_structure(self, file_path: str) -> int:
+    def get_new_filename_base(self, dir_string: str) -> str:
+        """
+        Given the directory of a file, build the cleaned prefix for its new filename
         """
-        Given a full file path, create a description from the dir structure and replace if necessary
+        filename_dir_string = dir_string
+        if not self.include_root:
+            filename_dir_string = filename_dir_string[len(self.directory):]
+
+        cleaned_dir_components = [self.clean_dirname(d) for d in filename_dir_string.split(os.sep)]
+        cleaned_dir_components = [d for d in cleaned_dir_components if d]  # Remove any empty components
+
+        return "_".join(cleaned_dir_components)
+
+    def rename_file(self, dir_path: str, entry: os.DirEntry, new_filename_base: str, dir_fd: Optional[int] = None) -> int:
+        """
+        Given a file in dir_path and the cleaned prefix for that directory, rename
+        the file if necessary.  If dir_fd is an open fd of dir_path, the rename is
+        done relative to it.
 
         Return codes:
             0  Updated
             1  Skipped
             -1 Error
         """
+        file_path = entry.path
         try:
-            (dir_string, filename_base, ext) = self.get_path_components(file_path)
-            if self.all_files or any([re.match(r, filename_base) for r in REPLACEABLE_PATTERNS]):
-                filename_dir_string = dir_string
-                if not self.include_root:
-                    filename_dir_string = filename_dir_string[len(self.directory):]
-
-                cleaned_dir_components = [self.clean_dirname(d) for d in filename_dir_string.split("/")]
-                cleaned_dir_components = [d for d in cleaned_dir_components if d]  # Remove any empty components
-
-                new_filename_base = "_".join(cleaned_dir_components)
+            # Check the pattern before doing any other path work, on a re-run most files won't match
+            filename_base, ext = os.path.splitext(entry.name)
+            if not (self.all_files or _REPLACEABLE_RE.match(filename_base) is not None):
+                logger.debug("Skipping file '%s' because it is not in the list of acceptable file patterns", file_path)
+                return 1
 
-                if filename_base.startswith(new_filename_base):
-                    logger.debug(f"Skipping file '{file_path}' because it seems to already be renamed")
-                    return 1
+            if filename_base.startswith(new_filename_base):
+                logger.debug("Skipping file '%s' because it seems to already be renamed", file_path)
+                return 1
 
-                new_filename = f"{new_filename_base}_{filename_base}{ext}"
-                new_file_path = f"{dir_string}/{new_filename}"
+            new_filename = f"{new_filename_base}_{filename_base}{ext.lower()}"
+            new_file_path = os.path.join(dir_path, new_filename)
 
-                logger.debug(f"Renaming file {file_path}  --->  {new_file_path}")
-                if not self.dry_run:
+            logger.debug("Renaming file %s  --->  %s", file_path, new_file_path)
+            if not self.dry_run:
+                if dir_fd is not None:
+                    os.rename(entry.name, new_filename, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                else:
                     os.rename(file_path, new_file_path)
 
-                return 0
-            else:
-                logger.debug(f"Skipping file '{file_path}' because it is not in the list of acceptable file patterns")
-                return 1
+            return 0
         except OSError as e:
-            logger.warning(f"Unable to process image {file_path} (OSError)", e)
+            logger.warning("Unable to process image %s (OSError): %s", file_path, e)
             return -1
         except Exception as e:
-            logger.error(f"Unexpected error occured while processing image {file_path}.", e)
+            logger.error("Unexpected error occured while processing image %s: %s", file_path, e)
             return -1
-        
-        return -1
 
-    def clean_directory_metadata(self, filepath: str) -> int:
-        ext = os.path.splitext(filepath)[1].lower()
+    def write_directory_structure(self, dir_path: str, entries: List[os.DirEntry]) -> List[int]:
+        """
+        Given a directory and its files, rename the files based on the dir structure
+        """
+        # Every file in the directory gets the same prefix, so only build it once
+        new_filename_base = self.get_new_filename_base(dir_path)
+        if self.dry_run or not _RENAME_DIR_FD:
+            return [self.rename_file(dir_path, entry, new_filename_base) for entry in entries]
+
         try:
-            if ext == '.jpg':
-                desc = self.get_description(filepath)
-                if desc and self.existing_prefix in desc:
-                    if not self.dry_run:
-                        self.remove_description(filepath)
-                    logger.debug(f"{self.update_msg} {filepath} -- Removed description")
-                    return 0
+            dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError as e:
+            logger.warning("Unable to open directory %s (OSError): %s", dir_path, e)
+            return [-1] * len(entries)
+        try:
+            return [self.rename_file(dir_path, entry, new_filename_base, dir_fd) for entry in entries]
+        finally:
+            os.close(dir_fd)
+
+    def clean_directory_metadata(self, dir_path: str, entries: List[os.DirEntry]) -> List[int]:
+        results = []
+        for entry in entries:
+            filepath = entry.path
+            ext = self.get_path_components(filepath)[2]
+            try:
+                if ext == '.jpg':
+                    desc = self.get_description(filepath)
+                    if desc and self.existing_prefix in desc:
+                        if not self.dry_run:
+                            self.remove_description(filepath)
+                        logger.debug("%s %s -- Removed description", self.update_msg, filepath)
+                        results.append(0)
+                    else:
+                        logger.debug("NOT Updated %s: '%s'", filepath, desc)
+                        results.append(1)
                 else:
-                    logger.debug(f"NOT Updated {filepath}: '{desc}'")
-                    return 1
-            else:
-                return 1
-        except Exception as e:
-            logger.error(f"Unexpected error occured while processing image {filepath}.", e)
-            return -1
+                    results.append(1)
+            except Exception as e:
+                logger.error("Unexpected error occured while processing image %s: %s", filepath, e)
+                results.append(-1)
+        return results
 
 
     def execute_on_files(self, func):
-        files = glob.glob('{}/**/*.*'.format(self.directory), recursive=True)
-        # files = [f for f in files if os.path.splitext(f)[1].lower() in REPLACEABLE_EXTENSIONS]
+        # Count the values for logging as we go.  Each directory's listing is complete
+        # before its files get renamed, so the walk never picks up files we just renamed.
+        counts = Counter()
+        for dir_path, entries in _walk(self.directory, REPLACEABLE_EXTENSIONS):
+            counts.update(func(dir_path, entries))
 
-        logger.info("Found {} files in {}".format(len(files), self.directory))
-        
-        results = [func(f) for f in files]
+        logger.info("Found %s files in %s", sum(counts.values()), self.directory)
 
         # with Pool(5) as p:
         #     results = p.map(func, files)
 
-        # Count the values for logging
-        updated_count = results.count(0)
-        skipped_count = results.count(1)
-        errored_count = results.count(-1)
+        updated_count = counts[0]
+        skipped_count = counts[1]
+        errored_count = counts[-1]
 
-        logger.info(f'{self.update_msg} {updated_count} files, Skipped {skipped_count} files, Failed {errored_count}')
+        logger.info('%s %s files, Skipped %s files, Failed %s', self.update_msg, updated_count, skipped_count, errored_count)
 
     def write_metadata(self):
         self.execute_on_files(self.write_directory_structure)